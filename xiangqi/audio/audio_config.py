@@ -2,6 +2,7 @@
 audio/audio_config.py
 音频配置文件 - 定义音频系统的配置和常量
 """
+import functools
 import os
 from typing import Dict, List, Tuple
 from enum import Enum
@@ -31,7 +32,9 @@ class AudioConfig:
     # 混音器设置
     FREQUENCY = 44100
     SIZE = -16  # 16位
-    CHANNELS = 8  # 同时播放的音效数量
+    OUTPUT_CHANNELS = 2  # 输出声道数（立体声）
+    CHANNELS = 8  # 同时播放的音效数量（由 AudioManager 分配的混音声道数）
+    EXTRA_CHANNELS = 2  # 额外的非保留声道，供直接调用 Sound.play() 的代码使用
     BUFFER = 1024
 
     # 默认音量
@@ -42,6 +45,9 @@ class AudioConfig:
     # 音效设置
     MAX_SOUND_INSTANCES = 3  # 同一音效最大同时播放实例数
     MIN_PLAY_DELAY = 0.1  # 相同音效最小播放间隔(秒)
+    MAX_LOADED_SOUNDS = 32  # 内存中最多保留的已加载音效数
+    LOADER_THREADS = 4  # 音效加载线程数（后台加载与预加载共用）
+    PRELOAD_SOUNDS = ['click', 'select']  # 启动时立即加载的音效，其余在首次播放时加载
 
     # ========== 音效文件配置 ==========
     # 支持的音频格式
@@ -72,9 +78,10 @@ class AudioConfig:
     }
 
     @classmethod
+    @functools.lru_cache(maxsize=None)
     def get_sfx_path(cls, sound_name: str) -> str:
         """
-        获取音效文件路径
+        获取音效文件路径（结果会被缓存，未配置的音效不会重复扫描文件夹）
 
         Args:
             sound_name: 音效名称（配置中的key）
@@ -3,17 +3,23 @@ audio/audio_manager.py
 音频管理器主类 - 统一管理音效播放
 """
 import pygame
+import io
 import os
 import time
 import json
+import heapq
+import itertools
+from array import array
+from collections import OrderedDict, defaultdict, deque
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from typing import Dict, List, Optional, Tuple, Callable
 from dataclasses import dataclass
 
 from audio_config import AudioConfig, SoundCategory, config
 
-@dataclass
+@dataclass(slots=True)
 class SoundInstance:
-    """音效实例信息"""
+    """音效实例信息（由 get_playing_instances() 按需生成，播放状态本身按声道分列存储）"""
     sound_name: str
     start_time: float
     channel_id: int
@@ -31,6 +37,12 @@ class AudioManager:
 
     _instance = None  # 单例模式
 
+    def __new__(cls):
+        # 全局只有一个管理器，保证声道分配、后台加载线程只有一份
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
     def __init__(self):
         if not hasattr(self, '_initialized'):
             self._initialized = True
@@ -50,63 +62,473 @@ class AudioManager:
         pygame.mixer.init(
             frequency=AudioConfig.FREQUENCY,
             size=AudioConfig.SIZE,
-            channels=AudioConfig.CHANNELS,
+            channels=AudioConfig.OUTPUT_CHANNELS,
             buffer=AudioConfig.BUFFER
         )
+        # 前 CHANNELS 个声道保留给管理器分配，直接调用 Sound.play() 只会用到其余声道
+        pygame.mixer.set_num_channels(AudioConfig.CHANNELS + AudioConfig.EXTRA_CHANNELS)
+        pygame.mixer.set_reserved(AudioConfig.CHANNELS)
 
         # 音频数据存储
-        self.sounds: Dict[str, pygame.mixer.Sound] = {}
+        self.sounds: OrderedDict[str, pygame.mixer.Sound] = OrderedDict()  # 按最近使用排序，超出上限时淘汰最久未用的
         self.sound_configs: Dict[str, dict] = {}
+        self.failed_sounds: set = set()  # 加载失败的音效，避免每次播放重复尝试
+
+        # 加载线程池：播放时未命中的音效在这里后台加载，主循环不阻塞；预加载也复用它并行解码
+        self._io_pool = ThreadPoolExecutor(max_workers=AudioConfig.LOADER_THREADS)
+        self._pending: Dict[str, Future] = {}  # 音效名 -> 加载任务
+        self._queued_volume: Dict[str, float] = {}  # 加载完成后需要补播的音效 -> 音量
 
         # 播放状态
-        self.playing_instances: List[SoundInstance] = []
+        num_channels = AudioConfig.CHANNELS
+        self.playing_instances: Dict[str, List[int]] = defaultdict(list)  # 音效名 -> 正在播放它的声道id
+        # 按声道id分列存储的播放状态，_chan_name 为 None 表示声道空闲
+        self._chan_name: List[Optional[str]] = [None] * num_channels
+        self._chan_start = array('d', [0.0] * num_channels)
+        self._chan_seq = array('q', [0] * num_channels)  # 每次播放的序号，用于识别堆中过期的条目
+        self._instance_heap: List[Tuple[float, int, int]] = []  # (开始时间, 序号, 声道id)，用于淘汰最早的实例
+        self._heap_seq = itertools.count(1)
+        self._free_channels: deque = deque(range(num_channels))  # 空闲声道id
+        # 声道播放结束时投递该事件，event.code 为声道id，由 handle_event() 回收声道
+        self.channel_end_event = pygame.event.custom_type()
+        for channel_id in range(num_channels):
+            pygame.mixer.Channel(channel_id).set_endevent(self.channel_end_event)
         self.last_play_time: Dict[str, float] = {}
         self.play_count: Dict[str, int] = {}
+        self._now = time.monotonic()  # 最近一次 update() 的时间戳
+        self._schedule: List[Tuple[float, str, float]] = []  # 延迟播放队列（小顶堆）：(触发时间, 音效名, 音量)
 
         # 音量设置
         self.master_volume = AudioConfig.MASTER_VOLUME
         self.sfx_volume = AudioConfig.SFX_VOLUME
+        self._combined_gain = self.master_volume * self.sfx_volume  # 主音量 * 音效音量
+        self._base_volume: Dict[str, float] = {}  # 音效名 -> 配置中的基础音量
 
-        # 加载音效
+        # 登记音效（按需加载）
         self.load_configured_sounds()
 
-        print(f"音频系统初始化完成，已加载 {len(self.sounds)} 个音效")
+        print(f"音频系统初始化完成，已登记 {len(self.sound_configs)} 个音效，预加载 {len(self.sounds)} 个")
 
-    def load_configured_sounds(self) -> Dict[str, bool]:
+    def load_configured_sounds(self, preload: Optional[List[str]] = None) -> Dict[str, bool]:
         """
-        加载配置中定义的音效
+        登记配置中定义的音效
+
+        只记录配置信息，不解码音频文件；音效在第一次 play() 时才加载。
+        preload 中列出的音效会立即加载，用于点击等要求即时响应的短音效。
+
+        Args:
+            preload: 需要立即加载的音效名列表，默认使用 AudioConfig.PRELOAD_SOUNDS
 
         Returns:
-            加载结果字典：音效名 -> 是否成功
+            预加载结果字典：音效名 -> 是否成功
         """
-        results = {}
-
         for sound_name, sound_config in AudioConfig.SOUND_MAPPINGS.items():
-            try:
-                # 获取文件路径
-                file_path = AudioConfig.get_sfx_path(sound_name)
-
-                if os.path.exists(file_path):
-                    # 加载音效
-                    sound = pygame.mixer.Sound(file_path)
-
-                    # 设置音量
-                    volume = sound_config.get('volume', 1.0)
-                    sound.set_volume(volume * self.master_volume * self.sfx_volume)
-
-                    # 存储音效
-                    self.sounds[sound_name] = sound
-                    self.sound_configs[sound_name] = sound_config
-                    self.play_count[sound_name] = 0
-
-                    results[sound_name] = True
-                    print(f"✓ 加载音效: {sound_name}")
-                else:
-                    results[sound_name] = False
-                    print(f"✗ 音效文件不存在: {file_path}")
-
-            except Exception as e:
-                results[sound_name] = False
-                print(f"✗ 加载音效失败 {sound_name}: {e}")
-
-        return results
\ No newline at end of file
+            self.sound_configs[sound_name] = sound_config
+            self.play_count[sound_name] = 0
+
+        if preload is None:
+            preload = AudioConfig.PRELOAD_SOUNDS
+
+        # 已在后台加载中的音效交给 load_sound() 等待，不重复提交
+        pending = [
+            name for name in preload
+            if name not in self.sounds and name not in self.failed_sounds and name not in self._pending
+        ]
+        if len(pending) > 1:
+            # 解码时 SDL 会释放 GIL，多个文件可以并行加载；写入 self.sounds 仍在当前线程完成
+            futures = {self._io_pool.submit(self._load_sync, name): name for name in pending}
+            for future in as_completed(futures):
+                self._store_sound(futures[future], future.result())
+
+        return {sound_name: self.load_sound(sound_name) for sound_name in preload}
+
+    def load_sound(self, sound_name: str) -> bool:
+        """
+        加载单个音效
+
+        Args:
+            sound_name: 音效名称（配置中的key，或音效文件夹中的文件名）
+
+        Returns:
+            是否加载成功
+        """
+        if sound_name in self.sounds:
+            return True
+        if sound_name in self.failed_sounds:
+            return False
+
+        # 已在后台加载时等待其完成，避免重复解码
+        future = self._pending.pop(sound_name, None)
+        if future is not None:
+            self._queued_volume.pop(sound_name, None)
+            return self._store_sound(sound_name, future.result())
+
+        return self._store_sound(sound_name, self._load_sync(sound_name))
+
+    def _load_sync(self, sound_name: str) -> Optional[pygame.mixer.Sound]:
+        """
+        读取并解码音效文件，不修改管理器状态，可在工作线程中调用
+
+        Args:
+            sound_name: 音效名称
+
+        Returns:
+            解码后的 Sound；失败时返回 None
+        """
+        try:
+            # 获取文件路径
+            file_path = AudioConfig.get_sfx_path(sound_name)
+
+            if not os.path.exists(file_path):
+                print(f"✗ 音效文件不存在: {file_path}")
+                return None
+
+            # 一次性读入整个文件，避免 SDL 逐块读取文件
+            with open(file_path, 'rb') as f:
+                data = f.read()
+
+            # 加载音效（Sound 在加载时已转换为混音器的采样格式，播放时无需再转换）
+            # 注意：buffer= 参数表示原始 PCM 数据，带文件头的数据要用文件对象传入
+            return pygame.mixer.Sound(file=io.BytesIO(data))
+
+        except Exception as e:
+            print(f"✗ 加载音效失败 {sound_name}: {e}")
+            return None
+
+    def _store_sound(self, sound_name: str, sound: Optional[pygame.mixer.Sound]) -> bool:
+        """
+        保存加载好的音效并设置音量
+
+        Args:
+            sound_name: 音效名称
+            sound: _load_sync 的结果，None 表示加载失败
+
+        Returns:
+            是否加载成功
+        """
+        if sound is None:
+            self.failed_sounds.add(sound_name)
+            return False
+
+        sound_config = self.sound_configs.get(sound_name, {})
+
+        # 设置音量
+        base_volume = sound_config.get('volume', 1.0)
+        sound.set_volume(base_volume * self._combined_gain)
+
+        # 存储音效
+        self.sounds[sound_name] = sound
+        self.sound_configs[sound_name] = sound_config
+        self._base_volume[sound_name] = base_volume
+        self.play_count.setdefault(sound_name, 0)
+
+        # 超出上限时卸载最久未使用的音效
+        while len(self.sounds) > AudioConfig.MAX_LOADED_SOUNDS:
+            evicted_name, _ = self.sounds.popitem(last=False)
+            self._base_volume.pop(evicted_name, None)
+
+        print(f"✓ 加载音效: {sound_name}")
+        return True
+
+    def play(self, sound_name: str, volume: float = 1.0, now: Optional[float] = None) -> bool:
+        """
+        播放音效
+
+        尚未加载的音效不会在这里同步加载（与早先的首次播放时同步加载不同）：
+        本次调用提交后台加载任务并返回 False，加载完成后由 update() 补播这一次。
+        因此调用方必须在游戏主循环中每帧调用 update()，否则首次播放会被丢弃；
+        需要立即可用的音效请放入 AudioConfig.PRELOAD_SOUNDS 或先调用 load_sound()。
+
+        Args:
+            sound_name: 音效名称
+            volume: 本次播放的相对音量 (0.0-1.0)
+            now: 当前时间戳 (time.monotonic())，同一帧内多次播放时可由调用方传入
+
+        Returns:
+            是否成功播放
+        """
+        if now is None:
+            now = time.monotonic()
+
+        sound_config = self.sound_configs.get(sound_name, {})
+        if not self._can_play_sound(sound_name, sound_config, now):
+            return False
+
+        if sound_name not in self.sounds:
+            self._collect_pending_load(sound_name)
+        if sound_name not in self.sounds:
+            if sound_name not in self.failed_sounds:
+                self._request_load(sound_name, volume)
+            return False
+
+        sound = self.sounds[sound_name]
+        self.sounds.move_to_end(sound_name)
+
+        channel_id = self._find_available_channel()
+        if channel_id is None:
+            return False
+        # Sound 本身保持 基础音量 * 主音量 * 音效音量；本次播放的相对音量设在声道上，
+        # 否则修改共享的 Sound 音量会影响该音效所有正在播放的实例
+        channel = pygame.mixer.Channel(channel_id)
+        channel.set_volume(volume)
+        channel.play(sound)
+
+        seq = next(self._heap_seq)
+        self._chan_name[channel_id] = sound_name
+        self._chan_start[channel_id] = now
+        self._chan_seq[channel_id] = seq
+        self.playing_instances[sound_name].append(channel_id)
+        heapq.heappush(self._instance_heap, (now, seq, channel_id))
+        self._compact_heap()
+        self.last_play_time[sound_name] = now
+        self.play_count[sound_name] = self.play_count.get(sound_name, 0) + 1
+        return True
+
+    def stop_sound(self, sound_name: str):
+        """
+        停止某个音效的所有播放实例
+
+        Args:
+            sound_name: 音效名称
+        """
+        for channel_id in self.playing_instances.pop(sound_name, []):
+            pygame.mixer.Channel(channel_id).stop()
+            self._release_channel(channel_id)
+
+    def shutdown(self):
+        """
+        关闭音频系统，须在 pygame.quit() 之前调用
+
+        先停止后台加载线程（取消排队的任务并等待正在进行的加载结束），
+        避免工作线程在混音器关闭后继续解码音频文件，然后再关闭混音器。
+        """
+        self._io_pool.shutdown(wait=True, cancel_futures=True)
+        self._pending.clear()
+        self._queued_volume.clear()
+        self._schedule.clear()
+
+        pygame.mixer.quit()
+        self.sounds.clear()
+        # 允许之后重新创建管理器
+        AudioManager._instance = None
+
+    def get_playing_instances(self) -> List[SoundInstance]:
+        """
+        获取当前正在播放的音效实例
+
+        Returns:
+            SoundInstance 列表
+        """
+        return [
+            SoundInstance(sound_name, self._chan_start[channel_id], channel_id)
+            for channel_id, sound_name in enumerate(self._chan_name)
+            if sound_name is not None
+        ]
+
+    def set_master_volume(self, volume: float):
+        """
+        设置主音量
+
+        Args:
+            volume: 音量 (0.0-1.0)
+        """
+        self.master_volume = max(0.0, min(1.0, volume))
+        self._combined_gain = self.master_volume * self.sfx_volume
+        self._update_all_volumes()
+
+    def set_sfx_volume(self, volume: float):
+        """
+        设置音效音量
+
+        Args:
+            volume: 音量 (0.0-1.0)
+        """
+        self.sfx_volume = max(0.0, min(1.0, volume))
+        self._combined_gain = self.master_volume * self.sfx_volume
+        self._update_all_volumes()
+
+    def _update_all_volumes(self):
+        """按当前音量设置刷新所有已加载音效"""
+        for sound_name, sound in self.sounds.items():
+            sound.set_volume(self._base_volume[sound_name] * self._combined_gain)
+
+    def handle_event(self, event: pygame.event.Event) -> bool:
+        """
+        处理声道播放结束事件，需要由游戏主循环把事件转发进来
+
+        Args:
+            event: pygame 事件
+
+        Returns:
+            是否为音频管理器的事件
+        """
+        if event.type != self.channel_end_event:
+            return False
+
+        channel_id = event.code
+        sound_name = self._chan_name[channel_id]
+        # 淘汰或停止声道时也会投递结束事件：声道已释放、或已在播放新音效时忽略
+        if sound_name is not None and not pygame.mixer.Channel(channel_id).get_busy():
+            self._remove_instance(sound_name, channel_id)
+            self._release_channel(channel_id)
+        return True
+
+    def update(self, now: Optional[float] = None):
+        """
+        每帧调用一次：收取后台加载完成的音效，触发到期的延迟播放
+
+        play() 的后台加载补播和 schedule() 的延迟播放都依赖这里；
+        声道回收依赖 handle_event()，两者都需要由游戏主循环驱动。
+
+        Args:
+            now: 本帧时间戳 (time.monotonic())，不传则在这里取一次
+        """
+        self._now = time.monotonic() if now is None else now
+
+        # 收取后台加载完成的音效，并补播加载期间请求的那一次
+        for sound_name in [name for name, future in self._pending.items() if future.done()]:
+            volume = self._queued_volume.get(sound_name)
+            if self._collect_pending_load(sound_name) and volume is not None:
+                self.play(sound_name, volume, self._now)
+
+        # 触发到期的延迟播放
+        while self._schedule and self._schedule[0][0] <= self._now:
+            _, sound_name, volume = heapq.heappop(self._schedule)
+            self.play(sound_name, volume, self._now)
+
+    def schedule(self, sound_name: str, delay: float, volume: float = 1.0, now: Optional[float] = None):
+        """
+        延迟播放音效，到期后在 update() 中播放
+
+        延迟队列只在 update() 中检查，调用方必须每帧调用 update()，否则排队的音效不会播放。
+
+        Args:
+            sound_name: 音效名称
+            delay: 延迟时间(秒)
+            volume: 相对音量 (0.0-1.0)
+            now: 计算延迟的起点，默认为当前时间
+        """
+        if now is None:
+            now = time.monotonic()
+        heapq.heappush(self._schedule, (now + delay, sound_name, volume))
+
+    def _request_load(self, sound_name: str, volume: float):
+        """
+        提交后台加载任务，并记录加载完成后要补播的音量
+
+        Args:
+            sound_name: 音效名称
+            volume: 补播时的相对音量
+        """
+        if sound_name not in self._pending:
+            self._pending[sound_name] = self._io_pool.submit(self._load_sync, sound_name)
+        self._queued_volume[sound_name] = volume
+
+    def _collect_pending_load(self, sound_name: str) -> bool:
+        """
+        若该音效的后台加载已完成，则保存结果
+
+        Returns:
+            是否已加载成功
+        """
+        future = self._pending.get(sound_name)
+        if future is None or not future.done():
+            return False
+        del self._pending[sound_name]
+        self._queued_volume.pop(sound_name, None)
+        return self._store_sound(sound_name, future.result())
+
+    def _can_play_sound(self, sound_name: str, sound_config: dict, now: Optional[float] = None) -> bool:
+        """
+        检查同时播放实例数和最小播放间隔限制
+
+        Args:
+            sound_name: 音效名称
+            sound_config: 音效配置
+            now: 当前时间戳，默认使用最近一次 update() 的时间
+
+        Returns:
+            是否允许播放
+        """
+        max_instances = sound_config.get('max_instances', AudioConfig.MAX_SOUND_INSTANCES)
+        if len(self.playing_instances.get(sound_name, ())) >= max_instances:
+            # 可能有实例已播完但结束事件还没被 handle_event() 处理
+            if self._reclaim_instances(sound_name) >= max_instances:
+                return False
+
+        min_delay = sound_config.get('min_delay', AudioConfig.MIN_PLAY_DELAY)
+        last_time = self.last_play_time.get(sound_name)
+        if now is None:
+            now = self._now
+        if last_time is not None and now - last_time < min_delay:
+            return False
+
+        return True
+
+    def _reclaim_instances(self, sound_name: str) -> int:
+        """
+        回收某个音效已播放完毕的实例
+
+        Returns:
+            仍在播放的实例数
+        """
+        still_playing = []
+        for channel_id in self.playing_instances.get(sound_name, ()):
+            if pygame.mixer.Channel(channel_id).get_busy():
+                still_playing.append(channel_id)
+            else:
+                self._release_channel(channel_id)
+        if still_playing:
+            self.playing_instances[sound_name] = still_playing
+        else:
+            # 不保留空列表，避免每帧遍历从未播放或已播完的音效名
+            self.playing_instances.pop(sound_name, None)
+        return len(still_playing)
+
+    def _remove_instance(self, sound_name: str, channel_id: int):
+        """从音效名索引中移除一个声道，列表为空时删除该键"""
+        channel_ids = self.playing_instances.get(sound_name)
+        if channel_ids is None:
+            return
+        channel_ids.remove(channel_id)
+        if not channel_ids:
+            del self.playing_instances[sound_name]
+
+    def _release_channel(self, channel_id: int):
+        """将声道标记为空闲并放回空闲队列"""
+        self._chan_name[channel_id] = None
+        self._free_channels.append(channel_id)
+
+    def _is_live_entry(self, seq: int, channel_id: int) -> bool:
+        """堆中的条目是否仍对应声道上正在播放的实例"""
+        return self._chan_name[channel_id] is not None and self._chan_seq[channel_id] == seq
+
+    def _compact_heap(self):
+        """堆中已结束实例的条目只在淘汰时才会弹出，过多时整体重建"""
+        active = len(self._chan_name) - len(self._free_channels)
+        if len(self._instance_heap) > 2 * active + 16:
+            self._instance_heap = [
+                entry for entry in self._instance_heap
+                if self._is_live_entry(entry[1], entry[2])
+            ]
+            heapq.heapify(self._instance_heap)
+
+    def _find_available_channel(self) -> Optional[int]:
+        """
+        取一个可用声道
+
+        Returns:
+            声道id；没有任何声道时返回 None
+        """
+        if self._free_channels:
+            return self._free_channels.popleft()
+
+        # 所有声道都在使用：停止最早开始的实例，复用它的声道
+        while self._instance_heap:
+            _, seq, channel_id = heapq.heappop(self._instance_heap)
+            if self._is_live_entry(seq, channel_id):
+                self._remove_instance(self._chan_name[channel_id], channel_id)
+                self._chan_name[channel_id] = None
+                pygame.mixer.Channel(channel_id).stop()
+                return channel_id
+        return None
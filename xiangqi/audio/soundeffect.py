@@ -2,10 +2,12 @@
 audio/soundeffect.py
 音效工具类 - 提供便捷的音效播放接口
 """
+import math
 import os
 import pygame
 import random
-from typing import List, Optional
+import time
+from typing import List, Optional, Tuple
 
 from audio_manager import AudioManager
 from audio_config import AudioConfig, config
@@ -22,6 +24,9 @@ class SoundEffect:
     4. 3D音效模拟
     """
 
+    def __init__(self, audio_manager: Optional[AudioManager] = None):
+        self.audio_manager = audio_manager or AudioManager()
+
     def on_enter(self, **kwards):
         base_path = Path(__file__).parent.parent / 'assets' / 'audio' / 'soundeffect'
 
@@ -54,6 +59,61 @@ class SoundEffect:
             print(f"播放点击音效失败: {e}")
             return False
 
+    def play_sequence(self, sound_names: List[str], delays: Optional[List[float]] = None, volume: float = 1.0):
+        """
+        按顺序播放一组音效
+
+        第一个音效立即播放，其余交给音频管理器的延迟队列，由 AudioManager.update() 触发。
+
+        Args:
+            sound_names: 音效名称列表
+            delays: delays[i] 为第 i 个与第 i+1 个音效之间的间隔(秒)，长度必须为 len(sound_names) - 1；
+                    默认每个间隔使用 AudioConfig.MIN_PLAY_DELAY
+            volume: 相对音量 (0.0-1.0)
+
+        Raises:
+            ValueError: delays 的长度不等于 len(sound_names) - 1
+        """
+        if not sound_names:
+            return
+        if delays is None:
+            delays = [AudioConfig.MIN_PLAY_DELAY] * (len(sound_names) - 1)
+        elif len(delays) != len(sound_names) - 1:
+            raise ValueError(f"delays 长度应为 {len(sound_names) - 1}，实际为 {len(delays)}")
+
+        now = time.monotonic()
+        self.audio_manager.play(sound_names[0], volume, now)
+        offset = 0.0
+        for sound_name, delay in zip(sound_names[1:], delays):
+            offset += delay
+            self.audio_manager.schedule(sound_name, offset, volume, now)
+
+    def play_spatial_sound(self, sound_name: str, source_pos: Tuple[float, float],
+                           listener_pos: Tuple[float, float], max_distance: float = 800.0,
+                           volume: float = 1.0) -> bool:
+        """
+        按声源与听者的距离衰减音量播放音效（简单的2D空间音效）
+
+        Args:
+            sound_name: 音效名称
+            source_pos: 声源坐标 (x, y)
+            listener_pos: 听者坐标 (x, y)
+            max_distance: 超过该距离不播放
+            volume: 相对音量 (0.0-1.0)
+
+        Returns:
+            是否成功播放
+        """
+        dx = source_pos[0] - listener_pos[0]
+        dy = source_pos[1] - listener_pos[1]
+        # 先比较距离平方，超出范围时不必开方
+        d2 = dx * dx + dy * dy
+        if d2 >= max_distance * max_distance:
+            return False
+
+        attenuation = max(0.1, 1.0 - math.sqrt(d2) / max_distance)
+        return self.audio_manager.play(sound_name, volume * attenuation)
+
 def select_play(volume:float = 0.8):
 
     try:
@@ -16,6 +16,10 @@ class MenuScene(Scene):
         #我的字体文件目录
         font_path = base_path.parent.parent / "assets" /"fonts" / "NotoSerifSC-Regular.otf"
         self.font = pygame.font.Font(str(font_path), 20)
+        self._bg_cache = None # (尺寸, 缩放后的背景)
+
+    def on_theme_change(self, theme):
+        self._bg_cache = None
 
     def handle_event(self, event):
         if event.type == pygame.KEYDOWN:
@@ -53,9 +57,10 @@ class MenuScene(Scene):
 
         new_w = int(bg_w * scale)
         new_h = int(bg_h * scale)
-        bg_scaled = pygame.transform.smoothscale(bg, (new_w, new_h))
+        if self._bg_cache is None or self._bg_cache[0] != (new_w, new_h):
+            self._bg_cache = ((new_w, new_h), pygame.transform.smoothscale(bg, (new_w, new_h)))
         bg_x, bg_y= (screen_w - new_w) // 2, (screen_h - new_h) // 2
-        screen.blit(bg_scaled, (bg_x, bg_y))
+        screen.blit(self._bg_cache[1], (bg_x, bg_y))
 
         init_bg_x = (screen_w - self.init_bg.get_width()) // 2
         init_bg_y = (screen_h - self.init_bg.get_height()) // 2
@@ -13,7 +13,34 @@ class PlayScene(Scene):
         self.selected = None
         self.cand_moves = []
         self.search_engine = SearchEngine()
+        self.debug = False # 为 True 时在棋盘上显示网格区域和交叉点
+        # 缩放结果缓存：(尺寸, Surface)，尺寸不变时直接 blit
+        self._bg_cache = None
+        self._board_cache = None
+        # 拖动改变窗口大小时先用快速缩放，停止 0.2 秒后再用 smoothscale 重建缓存
+        self._resizing = False
+        self._resize_idle = 0.0
+        # 棋子缩放缓存：(piece_code, piece_size) -> Surface
+        self._piece_cache: dict[tuple[int, int], pygame.Surface] = {}
+        self._last_piece_size = None
+        # 交叉点像素坐标，网格几何变化时才重新计算
+        self._grid_key = None
+        self._grid_overlay = None # (网格尺寸与间距, 调试图层)
+        self._xs: list[int] = []
+        self._ys: list[int] = []
+
+    def on_theme_change(self, theme):
+        # 主题切换后原图已更换，缓存失效
+        self._bg_cache = None
+        self._board_cache = None
+        self._piece_cache.clear()
+
     def handle_event(self, event):
+        if event.type == pygame.VIDEORESIZE:
+            self._resizing = True
+            self._resize_idle = 0.0
+            return
+
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
             rc = self.pixel_to_rc(event.pos)
             if rc is None:
@@ -67,16 +94,26 @@ class PlayScene(Scene):
                 self.selected = None
                 self.cand_moves = []
 
+    def update(self, dt: float):
+        if self._resizing:
+            self._resize_idle += dt
+            if self._resize_idle >= 0.2:
+                self._resizing = False
+                self._bg_cache = None
+                self._board_cache = None
+
     def draw(self, screen: pygame.Surface):
+        scale_fn = pygame.transform.scale if self._resizing else pygame.transform.smoothscale
         bg = self.game.assets.bg
         screen_w, screen_h = screen.get_size()
         bg_w, bg_h = bg.get_size()
         scale= max(screen_w / bg_w, screen_h / bg_h)
 
         new_w, new_h = int(bg_w * scale), int(bg_h * scale)
-        bg_scaled = pygame.transform.smoothscale(bg, (new_w, new_h))
+        if self._bg_cache is None or self._bg_cache[0] != (new_w, new_h):
+            self._bg_cache = ((new_w, new_h), scale_fn(bg, (new_w, new_h)))
         bg_x, bg_y= (screen_w - new_w) // 2, (screen_h - new_h) // 2
-        screen.blit(bg_scaled, (bg_x, bg_y))
+        screen.blit(self._bg_cache[1], (bg_x, bg_y))
 
         # 棋盘
         board_bg = self.game.assets.board_bg
@@ -92,9 +129,6 @@ class PlayScene(Scene):
         board_x = (screen_w - board_w) // 2
         board_y = (screen_h - board_h) // 2
 
-        board_bg_scaled = pygame.transform.smoothscale(board_bg, (board_w, board_h))
-        screen.blit(board_bg_scaled, (board_x, board_y))
-
         # 棋盘格子区域
         # 交叉点区域
         l = int(self.inset["l"] * board_w)
@@ -111,35 +145,71 @@ class PlayScene(Scene):
         self.dx = self.grid_rect.width / 8
         self.dy = self.grid_rect.height / 9
 
-        # 调试用 外框红色矩阵 + 棋盘绿色交叉网格点
-        # pygame.draw.rect(screen, (255,0,0), self.grid_rect, 2)
-        # for row in range(10):
-        #     for col in range(9):
-        #         x = self.grid_rect.left + col * self.dx
-        #         y = self.grid_rect.top + row * self.dy
-        #         pygame.draw.circle(screen, (0,255,0), (int(x), int(y)), 3)
+        grid_key = (self.grid_rect.left, self.grid_rect.top, self.dx, self.dy)
+        if grid_key != self._grid_key:
+            self._grid_key = grid_key
+            self._xs = [int(self.grid_rect.left + col * self.dx) for col in range(9)]
+            self._ys = [int(self.grid_rect.top + row * self.dy) for row in range(10)]
+
+        if self._board_cache is None or self._board_cache[0] != (board_w, board_h):
+            self._board_cache = ((board_w, board_h), scale_fn(board_bg, (board_w, board_h)))
+        screen.blit(self._board_cache[1], (board_x, board_y))
+
+        if self.debug:
+            self.draw_grid_overlay(screen)
 
         self.draw_pieces(screen)
 
+    def draw_grid_overlay(self, screen):
+        """调试用 外框红色矩阵 + 棋盘绿色交叉网格点，预先画在透明图层上，每帧只 blit 一次"""
+        pad = 4 # 留出交叉点圆点超出网格的部分
+        left, top = self.grid_rect.topleft
+        overlay_key = (self.grid_rect.size, self.dx, self.dy)
+        if self._grid_overlay is None or self._grid_overlay[0] != overlay_key:
+            overlay = pygame.Surface((self.grid_rect.width + 2 * pad, self.grid_rect.height + 2 * pad), pygame.SRCALPHA)
+            pygame.draw.rect(overlay, (255,0,0), pygame.Rect(pad, pad, self.grid_rect.width, self.grid_rect.height), 2)
+            for y in self._ys:
+                for x in self._xs:
+                    pygame.draw.circle(overlay, (0,255,0), (x - left + pad, y - top + pad), 3)
+            self._grid_overlay = (overlay_key, overlay)
+        screen.blit(self._grid_overlay[1], (left - pad, top - pad))
+
     def draw_pieces(self, screen):
         piece_size = int(min(self.dx, self.dy) * 0.9)
+        if piece_size != self._last_piece_size:
+            self._piece_cache.clear()
+            self._last_piece_size = piece_size
         selected_idx = rc_to_i(*self.selected) if self.selected else None
 
-        for row in range(10):
-            for col in range(9):
+        # 棋盘（含超出网格半个棋子的边缘）完全不在屏幕内时不绘制
+        screen_rect = screen.get_rect()
+        if not self.grid_rect.inflate(piece_size, piece_size).colliderect(screen_rect):
+            return
+
+        squares = self.board.squares
+        blit_list = []
+        for row, y in enumerate(self._ys):
+            for col, x in enumerate(self._xs):
                 idx = rc_to_i(row, col)
-                piece_code = self.board.squares[idx]
+                piece_code = squares[idx]
                 if piece_code == 0:
                     continue
                 if selected_idx is not None and idx == selected_idx:
                     continue
-                x, y = self.rc_to_pixel(row, col)
+                rect = pygame.Rect(0, 0, piece_size, piece_size)
+                rect.center = (x, y)
+                if not screen_rect.colliderect(rect):
+                    continue
 
-                piece_img = self.game.assets.get_piece_image(piece_code)
-                img_scaled = pygame.transform.smoothscale(piece_img, (piece_size, piece_size))
-                rect = img_scaled.get_rect(center=(x, y))
+                img_scaled = self._piece_cache.get((piece_code, piece_size))
+                if img_scaled is None:
+                    piece_img = self.game.assets.get_piece_image(piece_code)
+                    img_scaled = pygame.transform.smoothscale(piece_img, (piece_size, piece_size))
+                    self._piece_cache[(piece_code, piece_size)] = img_scaled
+                blit_list.append((img_scaled, rect))
 
-                screen.blit(img_scaled, rect)
+        # 所有棋子一次性提交绘制
+        screen.blits(blit_list, doreturn=False)
 
         self.draw_move_hints(screen)
 
@@ -188,9 +258,7 @@ class PlayScene(Scene):
 
     def rc_to_pixel(self, row, col):
         """将棋盘行列号转换为屏幕像素坐标（x, y）"""
-        x = self.grid_rect.left + col * self.dx
-        y = self.grid_rect.top + row * self.dy
-        return int(x), int(y)
+        return self._xs[col], self._ys[row]
 
 
 